@@ -8,13 +8,20 @@ import RPi.GPIO as GPIO
 GPIO.setwarnings(False)
 
 serial = spi(port=0, device=0, gpio_DC=25, gpio_RST=24)
+font = ImageFont.load_default()
+
+# Un buffer par taille (la rotation 1/3 inverse largeur/hauteur)
+buffers = {}
 
 for rot in (0, 1, 2, 3):
     device = ili9341(serial, width=320, height=240, rotate=rot)
 
-    img = Image.new("RGB", (device.width, device.height), "black")
-    draw = ImageDraw.Draw(img)
-    font = ImageFont.load_default()
+    W, H = device.width, device.height
+    if (W, H) not in buffers:
+        img = Image.new("RGB", (W, H))
+        buffers[(W, H)] = (img, ImageDraw.Draw(img))
+    img, draw = buffers[(W, H)]
+    draw.rectangle((0, 0, W, H), fill="black")
 
     draw.text((10, 10), f"ILI9341 OK - rotate={rot}", fill="white", font=font)
     draw.rectangle((10, 40, 110, 140), outline="white", fill="red")
@@ -25,5 +32,6 @@ for rot in (0, 1, 2, 3):
     time.sleep(2)
 
 # noir à la fin
-device.display(Image.new("RGB", (device.width, device.height), "black"))
+draw.rectangle((0, 0, W, H), fill="black")
+device.display(img)
 print("Done")
\ No newline at end of file
@@ -1,13 +1,13 @@
-import subprocess
+from subprocess import run
 import psutil
 
 class SystemTools:
     def shutdown(self):
-        subprocess.run(["sudo", "shutdown", "-h", "now"])
+        run(["sudo", "shutdown", "-h", "now"])
 
     def get_remote_users(self) -> list[dict] :
         return [
-            u._asdict()
+            {"name": u.name, "host": u.host}
             for u in psutil.users()
             if u.host
         ]
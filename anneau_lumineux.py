@@ -10,10 +10,13 @@
 # ============================================================================
 
 import time
+import signal
+import sys
 import board
 import neopixel
 import digitalio
 import json, os
+from functools import lru_cache
 from config_manager import get_config
 
 # ============================================
@@ -23,27 +26,44 @@ from config_manager import get_config
 cfg = get_config()
 leds_cfg = cfg.leds_config or {}
 
+
+def _get_cached_config():
+    """
+    Retourne la config partagée, rechargée seulement si config.json
+    a été modifié sur disque depuis le dernier chargement (et jamais
+    par-dessus des set(save=False) non sauvegardés d'un autre module).
+    """
+    cfg = get_config()
+    cfg.reload_if_changed()
+    return cfg
+
+
 # Configuration globale
 leds_off = not cfg.leds_enabled
 
+# Traces détaillées de l'éclairage scan (leds.verbose, activé par défaut)
+VERBOSE = bool(leds_cfg.get("verbose", True))
+
 # Configuration anneau 1 CAPOT
 anneau1_cfg = leds_cfg.get("anneau1", {})
 anneau1_enabled = anneau1_cfg.get("enabled", True) and not leds_off
-LED_PIN_1 = getattr(board, f"D{anneau1_cfg.get('pin', 18)}")
+GPIO_1 = anneau1_cfg.get("pin", 18)
+LED_PIN_1 = getattr(board, f"D{GPIO_1}")
 LED_COUNT_1 = anneau1_cfg.get("count", 24)
 BRIGHTNESS_1 = anneau1_cfg.get("brightness", 0.3)
 
 # Configuration anneau 2 LAMPE
 anneau2_cfg = leds_cfg.get("anneau2", {})
 anneau2_enabled = anneau2_cfg.get("enabled", True) and not leds_off
-LED_PIN_2 = getattr(board, f"D{anneau2_cfg.get('pin', 12)}")
+GPIO_2 = anneau2_cfg.get("pin", 12)
+LED_PIN_2 = getattr(board, f"D{GPIO_2}")
 LED_COUNT_2 = anneau2_cfg.get("count", 24)
 BRIGHTNESS_2 = anneau2_cfg.get("brightness", 0.3)
 
 print("📋 Configuration LEDs chargée:")
 print(f"  - Global: {'Activé' if not leds_off else 'Désactivé'}")
-print(f"  - Anneau 1: {'Activé' if anneau1_enabled else 'Désactivé'} (GPIO{anneau1_cfg.get('pin', 18)}, {LED_COUNT_1} LEDs, brightness {BRIGHTNESS_1})")
-print(f"  - Anneau 2: {'Activé' if anneau2_enabled else 'Désactivé'} (GPIO{anneau2_cfg.get('pin', 13)}, {LED_COUNT_2} LEDs, brightness {BRIGHTNESS_2})")
+print(f"  - Anneau 1: {'Activé' if anneau1_enabled else 'Désactivé'} (GPIO{GPIO_1}, {LED_COUNT_1} LEDs, brightness {BRIGHTNESS_1})")
+print(f"  - Anneau 2: {'Activé' if anneau2_enabled else 'Désactivé'} (GPIO{GPIO_2}, {LED_COUNT_2} LEDs, brightness {BRIGHTNESS_2})")
 
 # ============================================
 # INITIALISATION
@@ -59,7 +79,7 @@ else:
     if anneau1_enabled:
         try:
             pixels_1 = neopixel.NeoPixel(LED_PIN_1, LED_COUNT_1, brightness=BRIGHTNESS_1, auto_write=False)
-            print(f"✅ Anneau 1 initialisé (GPIO{anneau1_cfg.get('pin', 18)}, {LED_COUNT_1} LEDs)")
+            print(f"✅ Anneau 1 initialisé (GPIO{GPIO_1}, {LED_COUNT_1} LEDs)")
         except Exception as e:
             print(f"❌ Erreur init anneau 1 : {e}")
             pixels_1 = None
@@ -70,7 +90,7 @@ else:
     if anneau2_enabled:
         try:
             pixels_2 = neopixel.NeoPixel(LED_PIN_2, LED_COUNT_2, brightness=BRIGHTNESS_2, auto_write=False)
-            print(f"✅ Anneau 2 initialisé (GPIO{anneau2_cfg.get('pin', 13)}, {LED_COUNT_2} LEDs)")
+            print(f"✅ Anneau 2 initialisé (GPIO{GPIO_2}, {LED_COUNT_2} LEDs)")
         except Exception as e:
             print(f"❌ Erreur init anneau 2 : {e}")
             pixels_2 = None
@@ -78,97 +98,206 @@ else:
         print(f"⚠️ Anneau 2 désactivé via configuration")
 
 
+# ============================================
+# ROUE DES COULEURS (ARC-EN-CIEL)
+# ============================================
+
+def _roue(pos):
+    """Couleur (r, g, b) de la roue pour pos dans [0, 255]"""
+    if pos < 85:
+        return (pos * 3, 255 - pos * 3, 0)
+    elif pos < 170:
+        pos -= 85
+        return (255 - pos * 3, 0, pos * 3)
+    else:
+        pos -= 170
+        return (0, pos * 3, 255 - pos * 3)
+
+
+# Table précalculée : la roue ne dépend que d'un index 8 bits
+ROUE = tuple(_roue(p) for p in range(256))
+
+
+def _roue_offsets(count):
+    """Décalage de chaque LED sur la roue (réparti sur les 256 positions)"""
+    return tuple(i * 256 // count for i in range(count))
+
+
+@lru_cache(maxsize=4)
+def _trames_arc_en_ciel(count):
+    """
+    Les 256 trames de l'arc-en-ciel pour un anneau de `count` LEDs.
+    L'animation est périodique (cycle & 255) : on les calcule une seule fois.
+    """
+    base = _roue_offsets(count)
+    return tuple(
+        [ROUE[(o + cycle) & 255] for o in base]
+        for cycle in range(256)
+    )
+
+
+def _pulse_steps(couleur):
+    """Couleurs d'une pulsation complète (montée 0→95% puis descente 100→5%)"""
+    r, g, b_val = couleur
+    niveaux = list(range(0, 100, 5)) + list(range(100, 0, -5))
+    steps = []
+    for b in niveaux:
+        brightness = b / 100.0
+        steps.append((int(r * brightness), int(g * brightness), int(b_val * brightness)))
+    return tuple(steps)
+
+
+# ============================================
+# FONCTIONS GÉNÉRIQUES (UN ANNEAU DONNÉ)
+# ============================================
+
+def _regler_luminosite(pixels, brightness):
+    """Change la luminosité seulement si elle diffère (évite un re-scaling du buffer)"""
+    if pixels.brightness != brightness:
+        pixels.brightness = brightness
+
+
+def _eteindre(pixels, n):
+    """Éteint l'anneau n"""
+    if leds_off or not pixels:
+        return
+    pixels.fill((0, 0, 0))
+    pixels.show()
+    print(f"✨ Anneau {n} éteint")
+
+
+def _couleur_fixe(pixels, n, couleur, duree):
+    """Couleur fixe sur l'anneau n"""
+    if leds_off or not pixels:
+        return
+    pixels.fill(couleur)
+    pixels.show()
+    print(f"🎨 Anneau {n}: {couleur}")
+    if duree > 0:
+        time.sleep(duree)
+
+
+def _arc_en_ciel(pixels, count, n, cycles, vitesse):
+    """Arc-en-ciel sur l'anneau n"""
+    if leds_off or not pixels:
+        return
+    print(f"🌈 Arc-en-ciel anneau {n}...")
+
+    trames = _trames_arc_en_ciel(count)
+    show, sleep, monotonic = pixels.show, time.sleep, time.monotonic
+    deadline = monotonic()
+    for _ in range(cycles):
+        for trame in trames:
+            pixels[:] = trame
+            show()
+            deadline += vitesse
+            sleep(max(0, deadline - monotonic()))
+
+
+def _pulse(pixels, n, couleur, cycles, vitesse):
+    """Pulsation sur l'anneau n"""
+    if leds_off or not pixels:
+        return
+    print(f"💙 Pulsation anneau {n}: {couleur}")
+
+    steps = _pulse_steps(couleur)
+    fill, show, sleep, monotonic = pixels.fill, pixels.show, time.sleep, time.monotonic
+    deadline = monotonic()
+    precedente = None
+    for _ in range(cycles):
+        for c in steps:
+            # Couleur identique à la trame précédente (arrondi) : rien à renvoyer
+            if c != precedente:
+                fill(c)
+                show()
+                precedente = c
+            deadline += vitesse
+            sleep(max(0, deadline - monotonic()))
+
+
+def _eclairage_capture(pixels, n, brightness, color):
+    """Éclairage capture sur l'anneau n"""
+    if leds_off or not pixels:
+        return
+    _regler_luminosite(pixels, brightness)
+    pixels.fill(color)
+    pixels.show()
+    print(f"💡 Anneau {n} éclairage: brightness={brightness:.2f}")
+
+
+def _preparer_2_leds(pixels, count, brightness, leds, color):
+    """Écrit la trame d'éclairage partiel dans le buffer, sans l'envoyer"""
+    _regler_luminosite(pixels, brightness)
+    buf = [(0, 0, 0)] * count
+    for i in leds:
+        if i < count:
+            buf[i] = color
+    pixels[:] = buf
+
+
+def _eclairage_2_leds(pixels, count, n, brightness, leds, color, trace=True):
+    """Éclairage partiel de l'anneau n (seules les LEDs `leds` allumées)"""
+    if leds_off or not pixels:
+        return
+    _preparer_2_leds(pixels, count, brightness, leds, color)
+    pixels.show()
+    if trace:
+        print(f"💡 Anneau {n}: {len(leds)} LEDs actives")
+
+
+def _eclairage_2_leds_anneaux(numeros, brightness, leds, color):
+    """
+    Éclairage partiel sur plusieurs anneaux : toutes les trames sont
+    préparées d'abord, puis envoyées à la suite.
+    """
+    if leds_off:
+        return
+    actifs = [(n, p, count) for n, p, count in _anneaux() if n in numeros and p]
+    for _, p, count in actifs:
+        _preparer_2_leds(p, count, brightness, leds, color)
+    for _, p, _ in actifs:
+        p.show()
+    for n, _, _ in actifs:
+        print(f"💡 Anneau {n}: {len(leds)} LEDs actives")
+
+
+def _anneaux():
+    """(numéro, pixels, nombre de LEDs) des 2 anneaux, lus au moment de l'appel"""
+    return ((1, pixels_1, LED_COUNT_1), (2, pixels_2, LED_COUNT_2))
+
+
 # ============================================
 # FONCTIONS ANNEAU 1 UNIQUEMENT
 # ============================================
 
 def eteindre_anneau1():
     """Éteint uniquement l'anneau 1"""
-    if leds_off or not pixels_1:
-        return
-    pixels_1.fill((0, 0, 0))
-    pixels_1.show()
-    print("✨ Anneau 1 éteint")
+    _eteindre(pixels_1, 1)
 
 
 def couleur_fixe_anneau1(couleur, duree=3):
     """Couleur fixe sur anneau 1 uniquement"""
-    if leds_off or not pixels_1:
-        return
-    pixels_1.fill(couleur)
-    pixels_1.show()
-    print(f"🎨 Anneau 1: {couleur}")
-    if duree > 0:
-        time.sleep(duree)
+    _couleur_fixe(pixels_1, 1, couleur, duree)
 
 
 def arc_en_ciel_anneau1(cycles=3, vitesse=0.05):
     """Arc-en-ciel sur anneau 1 uniquement"""
-    if leds_off or not pixels_1:
-        return
-    print("🌈 Arc-en-ciel anneau 1...")
-    
-    def roue(pos):
-        if pos < 85:
-            return (pos * 3, 255 - pos * 3, 0)
-        elif pos < 170:
-            pos -= 85
-            return (255 - pos * 3, 0, pos * 3)
-        else:
-            pos -= 170
-            return (0, pos * 3, 255 - pos * 3)
-    
-    for cycle in range(cycles * 256):
-        for i in range(LED_COUNT_1):
-            pixel_index = (i * 256 // LED_COUNT_1) + cycle
-            pixels_1[i] = roue(pixel_index & 255)
-        pixels_1.show()
-        time.sleep(vitesse)
+    _arc_en_ciel(pixels_1, LED_COUNT_1, 1, cycles, vitesse)
 
 
 def pulse_anneau1(couleur=(0, 0, 255), cycles=3, vitesse=0.02):
     """Pulsation sur anneau 1 uniquement"""
-    if leds_off or not pixels_1:
-        return
-    print(f"💙 Pulsation anneau 1: {couleur}")
-    
-    for _ in range(cycles):
-        for b in range(0, 100, 5):
-            brightness = b / 100.0
-            r, g, b_val = couleur
-            pixels_1.fill((int(r * brightness), int(g * brightness), int(b_val * brightness)))
-            pixels_1.show()
-            time.sleep(vitesse)
-        
-        for b in range(100, 0, -5):
-            brightness = b / 100.0
-            r, g, b_val = couleur
-            pixels_1.fill((int(r * brightness), int(g * brightness), int(b_val * brightness)))
-            pixels_1.show()
-            time.sleep(vitesse)
+    _pulse(pixels_1, 1, couleur, cycles, vitesse)
 
 
 def eclairage_capture_anneau1(brightness=0.12, color=(255, 255, 255)):
     """Éclairage capture anneau 1 uniquement"""
-    if leds_off or not pixels_1:
-        return
-    pixels_1.brightness = brightness
-    pixels_1.fill(color)
-    pixels_1.show()
-    print(f"💡 Anneau 1 éclairage: brightness={brightness:.2f}")
+    _eclairage_capture(pixels_1, 1, brightness, color)
 
 
 def eclairage_2_leds_anneau1(brightness=0.15, leds=(18, 22), color=(255, 180, 60)):
     """Éclairage partiel anneau 1 uniquement"""
-    if leds_off or not pixels_1:
-        return
-    pixels_1.brightness = brightness
-    pixels_1.fill((0, 0, 0))
-    for i in leds:
-        if i < LED_COUNT_1:
-            pixels_1[i] = color
-    pixels_1.show()
-    print(f"💡 Anneau 1: {len(leds)} LEDs actives")
+    _eclairage_2_leds(pixels_1, LED_COUNT_1, 1, brightness, leds, color)
 
 
 # ============================================
@@ -177,91 +306,32 @@ def eclairage_2_leds_anneau1(brightness=0.15, leds=(18, 22), color=(255, 180, 60
 
 def eteindre_anneau2():
     """Éteint uniquement l'anneau 2"""
-    if leds_off or not pixels_2:
-        return
-    pixels_2.fill((0, 0, 0))
-    pixels_2.show()
-    print("✨ Anneau 2 éteint")
+    _eteindre(pixels_2, 2)
 
 
 def couleur_fixe_anneau2(couleur, duree=3):
     """Couleur fixe sur anneau 2 uniquement"""
-    if leds_off or not pixels_2:
-        return
-    pixels_2.fill(couleur)
-    pixels_2.show()
-    print(f"🎨 Anneau 2: {couleur}")
-    if duree > 0:
-        time.sleep(duree)
+    _couleur_fixe(pixels_2, 2, couleur, duree)
 
 
 def arc_en_ciel_anneau2(cycles=3, vitesse=0.05):
     """Arc-en-ciel sur anneau 2 uniquement"""
-    if leds_off or not pixels_2:
-        return
-    print("🌈 Arc-en-ciel anneau 2...")
-    
-    def roue(pos):
-        if pos < 85:
-            return (pos * 3, 255 - pos * 3, 0)
-        elif pos < 170:
-            pos -= 85
-            return (255 - pos * 3, 0, pos * 3)
-        else:
-            pos -= 170
-            return (0, pos * 3, 255 - pos * 3)
-    
-    for cycle in range(cycles * 256):
-        for i in range(LED_COUNT_2):
-            pixel_index = (i * 256 // LED_COUNT_2) + cycle
-            pixels_2[i] = roue(pixel_index & 255)
-        pixels_2.show()
-        time.sleep(vitesse)
+    _arc_en_ciel(pixels_2, LED_COUNT_2, 2, cycles, vitesse)
 
 
 def pulse_anneau2(couleur=(0, 0, 255), cycles=3, vitesse=0.02):
     """Pulsation sur anneau 2 uniquement"""
-    if leds_off or not pixels_2:
-        return
-    print(f"💙 Pulsation anneau 2: {couleur}")
-    
-    for _ in range(cycles):
-        for b in range(0, 100, 5):
-            brightness = b / 100.0
-            r, g, b_val = couleur
-            pixels_2.fill((int(r * brightness), int(g * brightness), int(b_val * brightness)))
-            pixels_2.show()
-            time.sleep(vitesse)
-        
-        for b in range(100, 0, -5):
-            brightness = b / 100.0
-            r, g, b_val = couleur
-            pixels_2.fill((int(r * brightness), int(g * brightness), int(b_val * brightness)))
-            pixels_2.show()
-            time.sleep(vitesse)
+    _pulse(pixels_2, 2, couleur, cycles, vitesse)
 
 
 def eclairage_capture_anneau2(brightness=0.12, color=(255, 255, 255)):
     """Éclairage capture anneau 2 uniquement"""
-    if leds_off or not pixels_2:
-        return
-    pixels_2.brightness = brightness
-    pixels_2.fill(color)
-    pixels_2.show()
-    print(f"💡 Anneau 2 éclairage: brightness={brightness:.2f}")
+    _eclairage_capture(pixels_2, 2, brightness, color)
 
 
 def eclairage_2_leds_anneau2(brightness=0.15, leds=(18, 22), color=(255, 180, 60)):
     """Éclairage partiel anneau 2 uniquement"""
-    if leds_off or not pixels_2:
-        return
-    pixels_2.brightness = brightness
-    pixels_2.fill((0, 0, 0))
-    for i in leds:
-        if i < LED_COUNT_2:
-            pixels_2[i] = color
-    pixels_2.show()
-    print(f"💡 Anneau 2: {len(leds)} LEDs actives")
+    _eclairage_2_leds(pixels_2, LED_COUNT_2, 2, brightness, leds, color)
 
 
 # ============================================
@@ -288,7 +358,7 @@ def eteindre_force():
         try:
             pixels_1.deinit()
             time.sleep(0.2)
-            pin = digitalio.DigitalInOut(board.D18)
+            pin = digitalio.DigitalInOut(LED_PIN_1)
             pin.direction = digitalio.Direction.OUTPUT
             pin.value = False
             time.sleep(0.2)
@@ -306,7 +376,7 @@ def eteindre_force():
         try:
             pixels_2.deinit()
             time.sleep(0.2)
-            pin = digitalio.DigitalInOut(board.D12)
+            pin = digitalio.DigitalInOut(LED_PIN_2)
             pin.direction = digitalio.Direction.OUTPUT
             pin.value = False
             time.sleep(0.2)
@@ -322,16 +392,21 @@ def eteindre_force():
 
 def couleur_fixe_tous(couleur, duree=3):
     """Couleur fixe sur les 2 anneaux"""
-    couleur_fixe_anneau1(couleur, duree=0)
-    couleur_fixe_anneau2(couleur, duree=0)
-    if duree > 0:
-        time.sleep(duree)
+    couleurs_differentes(couleur, couleur, duree=duree)
 
 
 def couleurs_differentes(couleur1, couleur2, duree=3):
     """Anneau 1 et anneau 2 avec couleurs différentes"""
-    couleur_fixe_anneau1(couleur1, duree=0)
-    couleur_fixe_anneau2(couleur2, duree=0)
+    if not leds_off:
+        # Remplir les 2 buffers d'abord, puis envoyer les 2 trames à la suite
+        anneaux = [(n, p, c) for n, p, c in ((1, pixels_1, couleur1), (2, pixels_2, couleur2)) if p]
+        for _, p, c in anneaux:
+            p.fill(c)
+        for _, p, _ in anneaux:
+            p.show()
+        for n, _, c in anneaux:
+            print(f"🎨 Anneau {n}: {c}")
+    # La pause est conservée même LEDs éteintes (comme avant)
     if duree > 0:
         time.sleep(duree)
 
@@ -344,8 +419,7 @@ def eclairage_capture(brightness=0.12):
 
 def eclairage_capture_2_leds(brightness=0.15, leds=(18, 22), color=(255, 180, 60)):
     """Éclairage 2 LEDs sur les 2 anneaux"""
-    eclairage_2_leds_anneau1(brightness, leds, color)
-    eclairage_2_leds_anneau2(brightness, leds, color)
+    _eclairage_2_leds_anneaux((1, 2), brightness, leds, color)
 
 
 # ============================================
@@ -364,6 +438,18 @@ VISION_PRESETS = {
     "cool": (180, 210, 255),
 }
 
+# Couleur de repli pour un preset inconnu (évite de re-chercher "white" à chaque appel)
+PRESET_DEFAUT = VISION_PRESETS["white"]
+
+# LEDs allumées par défaut en mode scan
+LEDS_SCAN_DEFAUT = (18, 22)
+
+
+def _leds_indices(scan_cfg):
+    """Indices des LEDs scan (tuple), sans réallouer le défaut à chaque appel"""
+    indices = scan_cfg.get("led_indices")
+    return LEDS_SCAN_DEFAUT if indices is None else tuple(indices)
+
 
 def eclairage_capture_2_leds_preset(
     brightness=0.08,
@@ -379,13 +465,9 @@ def eclairage_capture_2_leds_preset(
     if leds_off:
         return
     
-    color = VISION_PRESETS.get(preset, VISION_PRESETS["white"])
-    
-    if anneau is None or anneau == 1:
-        eclairage_2_leds_anneau1(brightness, leds, color)
-    
-    if anneau is None or anneau == 2:
-        eclairage_2_leds_anneau2(brightness, leds, color)
+    color = VISION_PRESETS.get(preset, PRESET_DEFAUT)
+    numeros = (1, 2) if anneau is None else (anneau,)
+    _eclairage_2_leds_anneaux(numeros, brightness, leds, color)
 
 
 
@@ -394,78 +476,109 @@ def _merge_dict(base: dict, override: dict) -> dict:
     if not override:
         return dict(base) if base else {}
     out = dict(base) if base else {}
-    out.update({k: v for k, v in override.items() if v is not None})
+    for k, v in override.items():
+        if v is not None:
+            out[k] = v
     return out
 
-def leds_on_for_scan_cfg():
+# Réglages scan résolus, réutilisés tant que (profil actif, version config) ne change pas
+_SCAN_CACHE = {"cle": None, "anneaux": None}
+
+
+def _resolve_scan_anneau(leds_cfg, led_scan_overrides, nom):
     """
-    Charge la config scan depuis config_manager
-    Utilise les configs SÉPARÉES pour chaque anneau
-    + surcharge possible via le lock_profile_active (camera.lock_profiles[*].led_scan)
+    Réglages scan figés d'un anneau ("anneau1" / "anneau2") :
+    (enabled, mode, brightness, leds, preset, color)
     """
-    cfg = get_config()
-    if not cfg.leds_enabled:
-        return
-
-    leds_cfg = cfg.leds_config or {}
+    anneau_cfg = leds_cfg.get(nom, {})
+    scan_cfg = anneau_cfg.get("scan", {}) or {}
 
+    # Merge overrides profil -> scan
+    scan_cfg = _merge_dict(scan_cfg, led_scan_overrides.get(nom, {}))
+
+    get = scan_cfg.get
+    enabled = get("enabled", True)
+    if not enabled:
+        # Anneau éteint pendant le scan : inutile de résoudre le reste
+        return (enabled, None, None, None, None, None)
+    mode = get("mode", "2_leds_preset")
+    brightness = float(get("brightness", 0.08))
+    brightness_max = get("brightness_max")
+    if brightness_max is not None:
+        brightness = min(brightness, float(brightness_max))
+    leds = _leds_indices(scan_cfg)
+    preset = get("preset", "neutral_warm")
+    color = VISION_PRESETS.get(preset, PRESET_DEFAUT)
+    return (enabled, mode, brightness, leds, preset, color)
+
+
+def _resolve_scan_cfg(cfg):
+    """
+    Retourne (lock_profile_active, (scan_anneau1, scan_anneau2)).
+    Recalculé uniquement si le profil actif ou la config (load()/set()) ont changé.
+    """
     # --------- Récupérer overrides LED depuis le profil caméra actif ---------
     cam_cfg = getattr(cfg, "camera_config", None) or getattr(cfg, "camera", None) or {}
     lock_profile_active = cam_cfg.get("lock_profile_active")
-    lock_profiles = cam_cfg.get("lock_profiles", {}) or {}
-    prof = lock_profiles.get(lock_profile_active, {}) if lock_profile_active else {}
-    led_scan_overrides = prof.get("led_scan", {}) or {}
 
-    # --------- Anneau 1 ---------
-    anneau1_cfg = leds_cfg.get("anneau1", {})
-    scan1_cfg = anneau1_cfg.get("scan", {}) or {}
+    cle = (lock_profile_active, cfg.version)
+    if _SCAN_CACHE["cle"] != cle:
+        leds_cfg = cfg.leds_config or {}
+        lock_profiles = cam_cfg.get("lock_profiles", {}) or {}
+        prof = lock_profiles.get(lock_profile_active, {}) if lock_profile_active else {}
+        led_scan_overrides = prof.get("led_scan", {}) or {}
 
-    # Merge overrides profil -> scan
-    scan1_cfg = _merge_dict(scan1_cfg, led_scan_overrides.get("anneau1", {}))
+        _SCAN_CACHE["anneaux"] = (
+            _resolve_scan_anneau(leds_cfg, led_scan_overrides, "anneau1"),
+            _resolve_scan_anneau(leds_cfg, led_scan_overrides, "anneau2"),
+        )
+        _SCAN_CACHE["cle"] = cle
 
-    anneau1_scan_enabled = scan1_cfg.get("enabled", True)
+    return lock_profile_active, _SCAN_CACHE["anneaux"]
 
-    # --------- Anneau 2 ---------
-    anneau2_cfg = leds_cfg.get("anneau2", {})
-    scan2_cfg = anneau2_cfg.get("scan", {}) or {}
 
-    # Merge overrides profil -> scan
-    scan2_cfg = _merge_dict(scan2_cfg, led_scan_overrides.get("anneau2", {}))
+def leds_on_for_scan_cfg():
+    """
+    Charge la config scan depuis config_manager
+    Utilise les configs SÉPARÉES pour chaque anneau
+    + surcharge possible via le lock_profile_active (camera.lock_profiles[*].led_scan)
+    """
+    cfg = _get_cached_config()
+    if not cfg.leds_enabled:
+        return
 
-    anneau2_scan_enabled = scan2_cfg.get("enabled", True)
+    lock_profile_active, scans = _resolve_scan_cfg(cfg)
 
-    print(f"📋 Éclairage scan (profil={lock_profile_active}):")
-    print(f"  - Anneau 1: {'Activé' if anneau1_scan_enabled else 'Désactivé'}")
-    print(f"  - Anneau 2: {'Activé' if anneau2_scan_enabled else 'Désactivé'}")
+    if VERBOSE:
+        print(f"📋 Éclairage scan (profil={lock_profile_active}):")
+        for n, scan in enumerate(scans, start=1):
+            print(f"  - Anneau {n}: {'Activé' if scan[0] else 'Désactivé'}")
 
-    # --------- Appliquer anneau 1 ---------
-    if anneau1_scan_enabled and pixels_1:
-        mode1 = scan1_cfg.get("mode", "2_leds_preset")
-        brightness1 = float(scan1_cfg.get("brightness", 0.08))
-        brightness1 = min(brightness1, float(scan1_cfg.get("brightness_max", brightness1)))
-        leds1 = tuple(scan1_cfg.get("led_indices", [18, 22]))
-        preset1 = scan1_cfg.get("preset", "neutral_warm")
-        color1 = VISION_PRESETS.get(preset1, VISION_PRESETS["white"])
+    anneaux = _anneaux()
+    if not any(scan[0] and pixels for (_, pixels, _), scan in zip(anneaux, scans)):
+        return
 
-        print(f"  🔍 DEBUG Anneau 1: mode={mode1} led_indices={leds1}")
+    # Préparer les trames des anneaux actifs, puis les envoyer à la suite
+    actifs = []
+    for (n, pixels, count), scan in zip(anneaux, scans):
+        enabled, mode, brightness, leds, preset, color = scan
+        if not (enabled and pixels):
+            continue
 
-        # ⚠️ Ici tu ignores mode1. Si tu as plusieurs modes, branche-les ici.
-        eclairage_2_leds_anneau1(brightness=brightness1, leds=leds1, color=color1)
-        print(f"  ✅ Anneau 1: {len(leds1)} LEDs, brightness={brightness1:.2f}, preset={preset1}")
+        if VERBOSE:
+            print(f"  🔍 DEBUG Anneau {n}: mode={mode} led_indices={leds}")
 
-    # --------- Appliquer anneau 2 ---------
-    if anneau2_scan_enabled and pixels_2:
-        mode2 = scan2_cfg.get("mode", "2_leds_preset")
-        brightness2 = float(scan2_cfg.get("brightness", 0.08))
-        brightness2 = min(brightness2, float(scan2_cfg.get("brightness_max", brightness2)))
-        leds2 = tuple(scan2_cfg.get("led_indices", [18, 22]))
-        preset2 = scan2_cfg.get("preset", "neutral_warm")
-        color2 = VISION_PRESETS.get(preset2, VISION_PRESETS["white"])
+        # ⚠️ Ici le mode est ignoré. Si tu as plusieurs modes, branche-les ici.
+        _preparer_2_leds(pixels, count, brightness, leds, color)
+        actifs.append((n, pixels, scan))
 
-        print(f"  🔍 DEBUG Anneau 2: mode={mode2} led_indices={leds2}")
+    for _, pixels, _ in actifs:
+        pixels.show()
 
-        eclairage_2_leds_anneau2(brightness=brightness2, leds=leds2, color=color2)
-        print(f"  ✅ Anneau 2: {len(leds2)} LEDs, brightness={brightness2:.2f}, preset={preset2}")
+    if VERBOSE:
+        for n, _, (_, _, brightness, leds, preset, _) in actifs:
+            print(f"💡 Anneau {n}: {len(leds)} LEDs actives")
+            print(f"  ✅ Anneau {n}: {len(leds)} LEDs, brightness={brightness:.2f}, preset={preset}")
 
 
 def leds_on_for_scan_cfg_legacy():
@@ -473,55 +586,58 @@ def leds_on_for_scan_cfg_legacy():
     Charge la config scan depuis config_manager
     Utilise les configs SÉPARÉES pour chaque anneau
     """
-    cfg = get_config()
+    cfg = _get_cached_config()
     if not cfg.leds_enabled:
         return
 
     leds_cfg = cfg.leds_config or {}
+    # Sans surcharge du profil caméra
+    scans = [_resolve_scan_anneau(leds_cfg, {}, nom) for nom in ("anneau1", "anneau2")]
     
-    # Configuration scan anneau 1
-    anneau1_cfg = leds_cfg.get("anneau1", {})
-    scan1_cfg = anneau1_cfg.get("scan", {})
-    anneau1_scan_enabled = scan1_cfg.get("enabled", True)
-    
-    # Configuration scan anneau 2
-    anneau2_cfg = leds_cfg.get("anneau2", {})
-    scan2_cfg = anneau2_cfg.get("scan", {})
-    anneau2_scan_enabled = scan2_cfg.get("enabled", True)
-    
-    print(f"📋 Éclairage scan:")
-    print(f"  - Anneau 1: {'Activé' if anneau1_scan_enabled else 'Désactivé'}")
-    print(f"  - Anneau 2: {'Activé' if anneau2_scan_enabled else 'Désactivé'}")
-    
-    # Appliquer config anneau 1
-    if anneau1_scan_enabled and pixels_1:
-        mode1 = scan1_cfg.get("mode", "2_leds_preset")
-        brightness1 = float(scan1_cfg.get("brightness", 0.08))
-        brightness1 = min(brightness1, float(scan1_cfg.get("brightness_max", brightness1)))
-        leds1 = tuple(scan1_cfg.get("led_indices", [18, 22]))
-        preset1 = scan1_cfg.get("preset", "neutral_warm")
-        color1 = VISION_PRESETS.get(preset1, VISION_PRESETS["white"])
-        
-        # 🔍 DEBUG : Afficher les indices chargés
-        print(f"  🔍 DEBUG Anneau 1: led_indices chargés = {leds1}")
-        
-        eclairage_2_leds_anneau1(brightness=brightness1, leds=leds1, color=color1)
-        print(f"  ✅ Anneau 1: {len(leds1)} LEDs, brightness={brightness1:.2f}, preset={preset1}")
+    if VERBOSE:
+        print(f"📋 Éclairage scan:")
+        for n, scan in enumerate(scans, start=1):
+            print(f"  - Anneau {n}: {'Activé' if scan[0] else 'Désactivé'}")
     
-    # Appliquer config anneau 2
-    if anneau2_scan_enabled and pixels_2:
-        mode2 = scan2_cfg.get("mode", "2_leds_preset")
-        brightness2 = float(scan2_cfg.get("brightness", 0.08))
-        brightness2 = min(brightness2, float(scan2_cfg.get("brightness_max", brightness2)))
-        leds2 = tuple(scan2_cfg.get("led_indices", [18, 22]))
-        preset2 = scan2_cfg.get("preset", "neutral_warm")
-        color2 = VISION_PRESETS.get(preset2, VISION_PRESETS["white"])
+    for (n, pixels, count), scan in zip(_anneaux(), scans):
+        enabled, mode, brightness, leds, preset, color = scan
+        if not (enabled and pixels):
+            continue
         
         # 🔍 DEBUG : Afficher les indices chargés
-        print(f"  🔍 DEBUG Anneau 2: led_indices chargés = {leds2}")
+        if VERBOSE:
+            print(f"  🔍 DEBUG Anneau {n}: led_indices chargés = {leds}")
         
-        eclairage_2_leds_anneau2(brightness=brightness2, leds=leds2, color=color2)
-        print(f"  ✅ Anneau 2: {len(leds2)} LEDs, brightness={brightness2:.2f}, preset={preset2}")
+        _eclairage_2_leds(pixels, count, n, brightness, leds, color, trace=VERBOSE)
+        if VERBOSE:
+            print(f"  ✅ Anneau {n}: {len(leds)} LEDs, brightness={brightness:.2f}, preset={preset}")
+
+
+# ============================================
+# LEDS DÉSACTIVÉES : FONCTIONS NEUTRES
+# ============================================
+
+def _noop(*args, **kwargs):
+    """Remplace les fonctions LED quand elles sont désactivées globalement"""
+    return None
+
+
+# couleur_fixe_tous / couleurs_differentes ne sont pas remplacées :
+# elles gardent leur pause `duree` même LEDs désactivées
+
+
+if leds_off:
+    for _nom in (
+        "eteindre_anneau1", "couleur_fixe_anneau1", "arc_en_ciel_anneau1",
+        "pulse_anneau1", "eclairage_capture_anneau1", "eclairage_2_leds_anneau1",
+        "eteindre_anneau2", "couleur_fixe_anneau2", "arc_en_ciel_anneau2",
+        "pulse_anneau2", "eclairage_capture_anneau2", "eclairage_2_leds_anneau2",
+        "eteindre", "eteindre_force",
+        "eclairage_capture", "eclairage_capture_2_leds", "eclairage_capture_2_leds_preset",
+        "leds_on_for_scan_cfg", "leds_on_for_scan_cfg_legacy",
+    ):
+        globals()[_nom] = _noop
+    del _nom
 
 
 # ============================================
@@ -538,8 +654,8 @@ def cleanup():
             pixels_1.show()
             pixels_1.deinit()
             print("✅ Anneau 1 nettoyé")
-        except:
-            pass
+        except Exception as e:
+            print(f"⚠️ Erreur nettoyage anneau 1: {e}")
     
     if pixels_2:
         try:
@@ -547,8 +663,8 @@ def cleanup():
             pixels_2.show()
             pixels_2.deinit()
             print("✅ Anneau 2 nettoyé")
-        except:
-            pass
+        except Exception as e:
+            print(f"⚠️ Erreur nettoyage anneau 2: {e}")
 
 
 # ============================================
@@ -587,9 +703,6 @@ def afficher_menu():
 
 def main():
     """Programme principal"""
-    import signal
-    import sys
-    
     def signal_handler(sig, frame):
         print("\n⚠️ Interruption (Ctrl+C)")
         cleanup()
@@ -597,6 +710,58 @@ def main():
     
     signal.signal(signal.SIGINT, signal_handler)
     
+    def scan_anneau(n, brightness_defaut, preset_defaut):
+        print(f"\n💡 Éclairage SCAN Anneau {n} (depuis config.json)...")
+        # Charger config scan de l'anneau n (sans surcharge du profil caméra)
+        cfg = _get_cached_config()
+        leds_cfg = cfg.leds_config or {}
+        scan_cfg = leds_cfg.get(f"anneau{n}", {}).get("scan", {})
+        
+        brightness = float(scan_cfg.get("brightness", brightness_defaut))
+        leds = _leds_indices(scan_cfg)
+        preset = scan_cfg.get("preset", preset_defaut)
+        color = VISION_PRESETS.get(preset, PRESET_DEFAUT)
+        
+        _, pixels, count = _anneaux()[n - 1]
+        print(f"  🔍 Config: brightness={brightness}, leds={leds}, preset={preset}")
+        _eclairage_2_leds(pixels, count, n, brightness, leds, color)
+        input("Appuyez sur Entrée pour éteindre...")
+        _eteindre(pixels, n)
+    
+    def scan_tous():
+        print("\n💡 Éclairage SCAN LES 2 (depuis config.json)...")
+        leds_on_for_scan_cfg()
+        input("Appuyez sur Entrée pour éteindre...")
+        eteindre()
+    
+    def test_config():
+        print("\n🎯 Chargement de l'éclairage SCAN depuis config.json...")
+        leds_on_for_scan_cfg()
+        print("\n✅ Éclairage appliqué selon votre configuration !")
+        print("Vérifiez visuellement les LEDs allumées.")
+        input("Appuyez sur Entrée pour éteindre...")
+        eteindre()
+    
+    actions = {
+        # Anneau 1
+        "1": lambda: arc_en_ciel_anneau1(cycles=2),
+        "2": lambda: pulse_anneau1((0, 0, 255), cycles=2),
+        "3": lambda: couleur_fixe_anneau1((255, 0, 0), duree=3),
+        "4": lambda: scan_anneau(1, 0.12, "neutral_warm"),
+        # Anneau 2
+        "5": lambda: arc_en_ciel_anneau2(cycles=2),
+        "6": lambda: pulse_anneau2((0, 0, 255), cycles=2),
+        "7": lambda: couleur_fixe_anneau2((0, 255, 0), duree=3),
+        "8": lambda: scan_anneau(2, 0.08, "white"),
+        # Les 2
+        "9": eteindre,
+        "10": lambda: couleur_fixe_tous((255, 255, 255), duree=3),
+        "11": lambda: couleurs_differentes((255, 0, 0), (0, 0, 255), duree=3),
+        "12": scan_tous,
+        # Configuration
+        "15": test_config,
+    }
+    
     print("\n🌟 Contrôleur 2 anneaux NeoPixel - Fonctions séparées 🌟\n")
     
     try:
@@ -604,85 +769,16 @@ def main():
             afficher_menu()
             choix = input("\n👉 Choix (0-15): ").strip()
             
-            # Anneau 1
-            if choix == "1":
-                arc_en_ciel_anneau1(cycles=2)
-            elif choix == "2":
-                pulse_anneau1((0, 0, 255), cycles=2)
-            elif choix == "3":
-                couleur_fixe_anneau1((255, 0, 0), duree=3)
-            elif choix == "4":
-                print("\n💡 Éclairage SCAN Anneau 1 (depuis config.json)...")
-                # Charger config anneau 1
-                cfg = get_config()
-                leds_cfg = cfg.leds_config or {}
-                anneau1_cfg = leds_cfg.get("anneau1", {})
-                scan1_cfg = anneau1_cfg.get("scan", {})
-                
-                brightness1 = float(scan1_cfg.get("brightness", 0.12))
-                leds1 = tuple(scan1_cfg.get("led_indices", [18, 22]))
-                preset1 = scan1_cfg.get("preset", "neutral_warm")
-                color1 = VISION_PRESETS.get(preset1, VISION_PRESETS["white"])
-                
-                print(f"  🔍 Config: brightness={brightness1}, leds={leds1}, preset={preset1}")
-                eclairage_2_leds_anneau1(brightness=brightness1, leds=leds1, color=color1)
-                input("Appuyez sur Entrée pour éteindre...")
-                eteindre_anneau1()
-            
-            # Anneau 2
-            elif choix == "5":
-                arc_en_ciel_anneau2(cycles=2)
-            elif choix == "6":
-                pulse_anneau2((0, 0, 255), cycles=2)
-            elif choix == "7":
-                couleur_fixe_anneau2((0, 255, 0), duree=3)
-            elif choix == "8":
-                print("\n💡 Éclairage SCAN Anneau 2 (depuis config.json)...")
-                # Charger config anneau 2
-                cfg = get_config()
-                leds_cfg = cfg.leds_config or {}
-                anneau2_cfg = leds_cfg.get("anneau2", {})
-                scan2_cfg = anneau2_cfg.get("scan", {})
-                
-                brightness2 = float(scan2_cfg.get("brightness", 0.08))
-                leds2 = tuple(scan2_cfg.get("led_indices", [18, 22]))
-                preset2 = scan2_cfg.get("preset", "white")
-                color2 = VISION_PRESETS.get(preset2, VISION_PRESETS["white"])
-                
-                print(f"  🔍 Config: brightness={brightness2}, leds={leds2}, preset={preset2}")
-                eclairage_2_leds_anneau2(brightness=brightness2, leds=leds2, color=color2)
-                input("Appuyez sur Entrée pour éteindre...")
-                eteindre_anneau2()
-            
-            # Les 2
-            elif choix == "9":
-                eteindre()
-            elif choix == "10":
-                couleur_fixe_tous((255, 255, 255), duree=3)
-            elif choix == "11":
-                couleurs_differentes((255, 0, 0), (0, 0, 255), duree=3)
-            elif choix == "12":
-                print("\n💡 Éclairage SCAN LES 2 (depuis config.json)...")
-                leds_on_for_scan_cfg()
-                input("Appuyez sur Entrée pour éteindre...")
-                eteindre()
-            
-            # Configuration
-            elif choix == "15":
-                print("\n🎯 Chargement de l'éclairage SCAN depuis config.json...")
-                leds_on_for_scan_cfg()
-                print("\n✅ Éclairage appliqué selon votre configuration !")
-                print("Vérifiez visuellement les LEDs allumées.")
-                input("Appuyez sur Entrée pour éteindre...")
-                eteindre()
-            
-            elif choix == "0":
+            if choix == "0":
                 print("\n👋 Arrêt...")
                 eteindre()
                 break
             
-            else:
+            action = actions.get(choix)
+            if action is None:
                 print("❌ Choix invalide")
+            else:
+                action()
             
             time.sleep(0.5)
     
@@ -28,6 +28,10 @@
 #         Wrapper qui charge automatiquement la calibration JSON, puis appelle
 #         analyze_colors_with_calibration(...).
 #
+#     - analyze_colors_cube(faces_cells, color_calibration=None, margin=0.25, debug=False)
+#         Même analyse calibrée sur plusieurs faces d'un coup (dict face -> cellules),
+#         une seule classification vectorisée pour les 54 cellules.
+#
 #     - analyze_colors_simple(cells, margin=0.25, debug=False)
 #         Variante “Cubotino-like” (HSV + correctifs Lab) plus robuste aux reflets,
 #         avec détection de faces à risque et heuristiques anti-confusions.
@@ -109,9 +113,7 @@ def _get_vision_mode() -> str:
 
 def _hue_deg_from_rgb(r: float, g: float, b: float) -> float:
     """Hue en degrés [0..360). OpenCV: H en [0..179]."""
-    px = np.uint8([[[int(b), int(g), int(r)]]])  # BGR pour OpenCV
-    hsv = cv2.cvtColor(px, cv2.COLOR_BGR2HSV)[0, 0]
-    h = float(hsv[0]) * 2.0
+    h = float(_hsv_u8_from_rgb(r, g, b)[0]) * 2.0  # formule scalaire, pas de cvtColor
     return h  # degrés
 
 def _circular_dist_deg(a: float, b: float) -> float:
@@ -120,11 +122,20 @@ def _circular_dist_deg(a: float, b: float) -> float:
     return min(d, 360.0 - d)
 
 
+def _median_px(px: np.ndarray) -> np.ndarray:
+    """Médiane par canal d'un tableau (N,3), via np.partition (O(N), même résultat que np.median)."""
+    n = px.shape[0]
+    k = n // 2
+    if n % 2:
+        return np.partition(px, k, axis=0)[k].astype(np.float64)
+    part = np.partition(px, (k - 1, k), axis=0)
+    return (part[k - 1].astype(np.float64) + part[k]) / 2.0
+
+
 def sample_rgb_from_cell_bgr(cell_bgr: np.ndarray, margin: float = 0.25) -> tuple[float, float, float]:
     """
     Mesure robuste de couleur dans une cellule:
     - coupe une marge (par défaut 25%) pour éviter bords/joints/reflets
-    - blur léger
     - rejette les pixels specular (reflets blancs) via HSV (V haut + S bas)
     - médiane (plus robuste que la moyenne)
     Retourne (r,g,b).
@@ -139,24 +150,23 @@ def sample_rgb_from_cell_bgr(cell_bgr: np.ndarray, margin: float = 0.25) -> tupl
     if roi.size == 0:
         roi = cell_bgr
 
-    roi = cv2.GaussianBlur(roi, (3, 3), 0)
+    # Pas de blur : la médiane absorbe déjà le bruit pixel
+    # (le blur reste dans la version legacy)
 
     # --- NOUVEAU: rejet des reflets (specular) ---
     hsv = cv2.cvtColor(roi, cv2.COLOR_BGR2HSV)
-    S = hsv[..., 1]
-    V = hsv[..., 2]
 
-    # Pixels "reflet": très lumineux et peu saturés
-    spec = (V > 240) & (S < 90)
+    # Pixels "reflet": très lumineux et peu saturés (V > 240 et S < 90)
+    spec = cv2.inRange(hsv, (0, 0, 241), (255, 89, 255))
 
     flat = roi.reshape(-1, 3)
-    keep = (~spec).reshape(-1)
+    keep = spec.reshape(-1) == 0
 
-    if keep.sum() > 20:  # assez de pixels non-reflets
-        bgr = np.median(flat[keep], axis=0)
+    if flat.shape[0] - cv2.countNonZero(spec) > 20:  # assez de pixels non-reflets
+        bgr = _median_px(flat[keep])
     else:
         # fallback si presque tout est reflet
-        bgr = np.median(flat, axis=0)
+        bgr = _median_px(flat)
     # --- fin nouveau ---
 
     b, g, r = bgr
@@ -182,7 +192,7 @@ def sample_rgb_from_cell_bgr_legacy(cell_bgr: np.ndarray, margin: float = 0.25)
 
     roi = cv2.GaussianBlur(roi, (3, 3), 0)
 
-    bgr = np.median(roi.reshape(-1, 3), axis=0)
+    bgr = _median_px(roi.reshape(-1, 3))
     b, g, r = bgr
     return (float(r), float(g), float(b))
 # ---------------------------
@@ -236,13 +246,23 @@ def quad_to_np(roi_quad) -> np.ndarray:
 # Chargement / Sauvegarde RGB
 # ---------------------------
 
+# Cache du JSON parsé : path -> (mtime, calib)
+_CALIB_CACHE: Dict[str, Tuple[float, Dict[str, Tuple[float, float, float, float]]]] = {}
+
+
 def load_color_calibration(path="rubiks_color_calibration.json"):
     """
     Charge la calibration couleurs (centres RGB + tol) depuis le JSON.
     Retourne dict: name -> (r,g,b,tol)
+    Le JSON n'est relu que si sa date de modification a changé.
     """
-    with open(path, "r") as f:
-        data = json.load(f)
+    mtime = os.stat(path).st_mtime
+    cached = _CALIB_CACHE.get(path)
+    if cached is not None and cached[0] == mtime:
+        return dict(cached[1])
+
+    with open(path, "rb") as f:
+        data = json.loads(f.read())
 
     color_data = data.get("color_data", data)  # sécurité si format différent
 
@@ -251,8 +271,9 @@ def load_color_calibration(path="rubiks_color_calibration.json"):
         r, g, b, tol = arr
         calib[name] = (float(r), float(g), float(b), float(tol))
 
+    _CALIB_CACHE[path] = (mtime, calib)
     print("Calibration couleurs chargée:", list(calib.keys()))
-    return calib
+    return dict(calib)
 
 
 
@@ -270,10 +291,12 @@ def save_color_calibration(color_calibration: Dict[str, Tuple[float,float,float,
             },
             "color_data": color_data,
         }
+        blob = json.dumps(payload, indent=2, ensure_ascii=False).encode("utf-8")
         tmp = filename + ".tmp"
-        with open(tmp, "w", encoding="utf-8") as f:
-            json.dump(payload, f, indent=2, ensure_ascii=False)
+        with open(tmp, "wb") as f:
+            f.write(blob)
         os.replace(tmp, filename)
+        _CALIB_CACHE.pop(filename, None)
         print(f"Calibration couleurs sauvegardée: {filename}")
         return True
     except Exception as e:
@@ -290,8 +313,7 @@ def _avg_center_rgb(cell_roi) -> Tuple[float,float,float]:
     center = cell_roi[ch:h-ch, cw:w-cw]
     if center.size == 0:
         return (0.0, 0.0, 0.0)
-    mean_bgr = np.mean(center, axis=(0,1))
-    b, g, r = mean_bgr
+    b, g, r, _ = cv2.mean(center)  # un seul appel C (BGR)
     return float(r), float(g), float(b)
 
 def _avg_center_rgb_from_bgr_roi(roi_bgr: np.ndarray, frac: float = 0.35):
@@ -305,14 +327,38 @@ def _avg_center_rgb_from_bgr_roi(roi_bgr: np.ndarray, frac: float = 0.35):
     x0 = (w - cw) // 2
     patch = roi_bgr[y0:y0+ch, x0:x0+cw]
 
-    b, g, r = patch.reshape(-1, 3).mean(axis=0)
+    b, g, r, _ = cv2.mean(patch)
     return float(r), float(g), float(b)
 
 
+# Tables virgule fixe (shift 12) identiques à cv2.cvtColor RGB2HSV 8 bits
+_HSV_SHIFT = 12
+_HSV_ROUND = 1 << (_HSV_SHIFT - 1)
+_SDIV = (0,) + tuple(int(round((255 << _HSV_SHIFT) / i)) for i in range(1, 256))
+_HDIV = (0,) + tuple(int(round(30 * (1 << _HSV_SHIFT) / i)) for i in range(1, 256))
+
+
+def _hsv_u8_from_rgb(r: float, g: float, b: float) -> Tuple[int, int, int]:
+    """(h,s,v) unités OpenCV (H 0..179) d'un seul pixel, sans passer par cv2."""
+    r, g, b = int(r), int(g), int(b)
+    v = max(r, g, b)
+    d = v - min(r, g, b)
+    s = (d * _SDIV[v] + _HSV_ROUND) >> _HSV_SHIFT
+    if d == 0:
+        return 0, s, v
+    if v == r:
+        h = g - b
+    elif v == g:
+        h = b - r + 2 * d
+    else:
+        h = r - g + 4 * d
+    h = (h * _HDIV[d] + _HSV_ROUND) >> _HSV_SHIFT
+    return (h + 180 if h < 0 else h), s, v
+
+
 def classify_color_default(r: float, g: float, b: float) -> str:
-    # Utilise HSV pour une classification robuste
-    rgb_norm = np.array([[[r, g, b]]], dtype=np.uint8)
-    h, s, v = map(float, cv2.cvtColor(rgb_norm, cv2.COLOR_RGB2HSV)[0,0])
+    # Utilise HSV pour une classification robuste (formule scalaire, 1 pixel)
+    h, s, v = map(float, _hsv_u8_from_rgb(r, g, b))
     if s < 50 and v > 200: return "white"
     if s < 50 and v < 50:  return "black"
     if h < 10 or h > 170:  return "red"
@@ -333,7 +379,7 @@ def classify_with_calibration(
     color_calibration: dict {name: (rr, gg, bb, tol)}
 
     Logique:
-      1) shortlist par tol (distance RGB <= tol)
+      1) shortlist par tol (distance RGB² <= tol²)
       2) best = plus proche en RGB parmi candidats
       3) arbitres HSV (Hue) pour couples ambigus:
          - yellow vs orange
@@ -341,30 +387,55 @@ def classify_with_calibration(
          (même si l'autre n'est pas dans candidates)
     """
 
-    # 1) shortlist par tol (RGB)
-    candidates = []
+    # 1) + 2) une seule passe : plus proche dans la tol, et plus proche tout court
+    best_in, min_in = None, float("inf")
+    best_any, min_any = "unknown", float("inf")
     for name, (rr, gg, bb, tol) in color_calibration.items():
-        d = ((r - rr) ** 2 + (g - gg) ** 2 + (b - bb) ** 2) ** 0.5
-        if d <= float(tol):
-            candidates.append((d, name))
-
-    # 2) fallback si aucun candidat: plus proche RGB sans tol
-    if not candidates:
-        best = "unknown"
-        min_d = float("inf")
-        for name, (rr, gg, bb, _tol) in color_calibration.items():
-            d = ((r - rr) ** 2 + (g - gg) ** 2 + (b - bb) ** 2) ** 0.5
-            if d < min_d:
-                min_d = d
-                best = name
-        return best
+        d2 = (r - rr) ** 2 + (g - gg) ** 2 + (b - bb) ** 2  # distance², pas de sqrt
+        if d2 < min_any:
+            min_any, best_any = d2, name
+        if d2 <= float(tol) ** 2 and d2 < min_in:
+            min_in, best_in = d2, name
+
+    # fallback si aucun candidat: plus proche RGB sans tol (pas d'arbitre)
+    if best_in is None:
+        return best_any
 
     # best RGB parmi candidats
-    candidates.sort(key=lambda x: x[0])
-    best = candidates[0][1]
+    return _arbitrage_hsv(best_in, r, g, b, color_calibration, debug_hsv)
+
+
+# Dernière calibration empilée (même contenu => mêmes arrays)
+_CALIB_ARRAYS_CACHE = {"cle": None, "arrays": None}
+
+
+def _calib_arrays(color_calibration):
+    """Empile la calibration : (noms, centres RGB (K,3), tol² (K,), {nom: hue en degrés})."""
+    cle = tuple(color_calibration.items())
+    if _CALIB_ARRAYS_CACHE["cle"] == cle:
+        return _CALIB_ARRAYS_CACHE["arrays"]
+
+    names = [n for n, _ in cle]
+    vals = np.array([v for _, v in cle], dtype=np.float64).reshape(-1, 4)
+    centers = vals[:, :3]
+    # Hue des centres calculée une fois (un seul cvtColor, même arrondi que _hue_deg_from_rgb)
+    hues = cv2.cvtColor(centers.astype(np.uint8).reshape(1, -1, 3), cv2.COLOR_RGB2HSV)[0, :, 0] * 2.0 \
+        if names else ()
+    arrays = (names, centers, vals[:, 3] ** 2, dict(zip(names, map(float, hues))))
+
+    _CALIB_ARRAYS_CACHE["cle"] = cle
+    _CALIB_ARRAYS_CACHE["arrays"] = arrays
+    return arrays
+
+
+def _arbitrage_hsv(best: str, r: float, g: float, b: float,
+                   color_calibration, debug_hsv: bool = False,
+                   h: Optional[float] = None) -> str:
+    """Arbitres HSV (Hue) appliqués au meilleur candidat RGB (h: hue déjà calculée, optionnelle)."""
     # --- Correction robuste Yellow/Orange via Hue ---
     if best in ("yellow", "orange"):
-        h = _hue_deg_from_rgb(r, g, b)
+        if h is None:
+            h = _hue_deg_from_rgb(r, g, b)
         if debug_hsv:
             print(f"[HSV RULE] best={best} RGB=({r:.0f},{g:.0f},{b:.0f}) h={h:.1f}")
 
@@ -374,13 +445,12 @@ def classify_with_calibration(
     # 3) Arbitre HSV (Hue) — robuste et systématique
     # a) yellow vs orange
     if best in ("yellow", "orange") and "yellow" in color_calibration and "orange" in color_calibration:
-        h = _hue_deg_from_rgb(r, g, b)
+        if h is None:
+            h = _hue_deg_from_rgb(r, g, b)
 
-        ry, gy, by, _ = color_calibration["yellow"]
-        ro, go, bo, _ = color_calibration["orange"]
-
-        hy = _hue_deg_from_rgb(ry, gy, by)
-        ho = _hue_deg_from_rgb(ro, go, bo)
+        hues_cal = _calib_arrays(color_calibration)[3]
+        hy = hues_cal["yellow"]
+        ho = hues_cal["orange"]
 
         dy = _circular_dist_deg(h, hy)
         do = _circular_dist_deg(h, ho)
@@ -394,13 +464,12 @@ def classify_with_calibration(
 
     # b) red vs orange
     if best in ("red", "orange") and "red" in color_calibration and "orange" in color_calibration:
-        h = _hue_deg_from_rgb(r, g, b)
-
-        rr, gr, br, _ = color_calibration["red"]
-        ro, go, bo, _ = color_calibration["orange"]
+        if h is None:
+            h = _hue_deg_from_rgb(r, g, b)
 
-        hr = _hue_deg_from_rgb(rr, gr, br)
-        ho = _hue_deg_from_rgb(ro, go, bo)
+        hues_cal = _calib_arrays(color_calibration)[3]
+        hr = hues_cal["red"]
+        ho = hues_cal["orange"]
 
         dr = _circular_dist_deg(h, hr)
         do = _circular_dist_deg(h, ho)
@@ -415,12 +484,51 @@ def classify_with_calibration(
     return best
 
 
+def classify_many_with_calibration(rgbs, color_calibration, debug_hsv: bool = False) -> List[str]:
+    """
+    Version vectorisée de classify_with_calibration sur N cellules.
+    rgbs: séquence/array (N,3) de (r,g,b)
+
+    Matrice (N,K) des distances² aux centres calibrés, comparée aux tol²
+    (pas de sqrt), puis mêmes arbitres HSV que la version scalaire.
+    """
+    rgb = np.asarray(rgbs, dtype=np.float64).reshape(-1, 3)
+    if len(rgb) == 0:
+        return []
+    names, centers, tol2, _hues = _calib_arrays(color_calibration)
+    if not names:
+        return ["unknown"] * len(rgb)
+
+    d2 = ((rgb[:, None, :] - centers[None, :, :]) ** 2).sum(axis=-1)
+    in_tol = d2 <= tol2[None, :]
+
+    has_cand = in_tol.any(axis=1)
+
+    # 1) plus proche parmi les candidats (tol), 2) sinon plus proche sans tol
+    idx = np.where(has_cand,
+                   np.where(in_tol, d2, np.inf).argmin(axis=1),
+                   d2.argmin(axis=1))
+
+    # Hue de toutes les cellules en un seul cvtColor (même arrondi que _hue_deg_from_rgb)
+    hues = cv2.cvtColor(rgb.astype(np.uint8).reshape(1, -1, 3), cv2.COLOR_RGB2HSV)[0, :, 0] * 2.0
+
+    out = []
+    for (r, g, b), k, cand, h in zip(rgb, idx, has_cand, hues):
+        best = names[k]
+        # 3) arbitres HSV seulement si un candidat était dans la tolérance
+        if cand:
+            best = _arbitrage_hsv(best, float(r), float(g), float(b), color_calibration,
+                                  debug_hsv, h=float(h))
+        out.append(best)
+    return out
+
+
 
 def is_white_lab(roi_bgr: np.ndarray, frac: float = 0.35,
                  L_min: float = 40.0, chroma_max: float = 28.0) -> bool:
     """
     Détecte blanc/gris via Lab (robuste aux ombres).
-    - ROI OpenCV = BGR
+    - ROI OpenCV = BGR, moyenne BGR puis conversion Lab
     - a,b neutres ~128 => faible chroma
     """
     h, w = roi_bgr.shape[:2]
@@ -429,8 +537,9 @@ def is_white_lab(roi_bgr: np.ndarray, frac: float = 0.35,
     x0 = (w - cw) // 2
     patch = roi_bgr[y0:y0+ch, x0:x0+cw]
 
-    lab = cv2.cvtColor(patch, cv2.COLOR_BGR2LAB)
-    L, a, b = lab.reshape(-1, 3).mean(axis=0)
+    # Lab du pixel moyen (1 pixel converti au lieu du patch entier)
+    bm, gm, rm, _ = cv2.mean(patch)
+    L, a, b = _lab_Lab_from_rgb_sample(rm, gm, bm)
 
     chroma = math.sqrt((a - 128.0)**2 + (b - 128.0)**2)
 
@@ -446,15 +555,11 @@ def analyze_colors_with_calibration(
     cells: liste de ((i,j), cell_roi_bgr)
     color_calibration: dict[name] = (r,g,b,tol)
     """
-    out = []
-
-    for idx, ((i, j), cell_roi) in enumerate(cells):
-        r, g, b = sample_rgb_from_cell_bgr(cell_roi, margin=margin)
-
-        col = classify_with_calibration(r, g, b, color_calibration,debug_hsv=True)
-        out.append(col)
+    rgbs = [sample_rgb_from_cell_bgr(cell_roi, margin=margin) for (_ij, cell_roi) in cells]
+    out = classify_many_with_calibration(rgbs, color_calibration, debug_hsv=True)
 
-        if debug:
+    if debug:
+        for idx, (((i, j), _roi), (r, g, b), col) in enumerate(zip(cells, rgbs, out)):
             print(f"[CALIB] cell {idx+1} ({i},{j}) RGB=({r:.0f},{g:.0f},{b:.0f}) -> {col}")
 
     return out
@@ -465,6 +570,36 @@ def analyze_colors(cells) -> List[str]:
     return analyze_colors_with_calibration(cells, calib, debug=True)
 
 
+def analyze_colors_cube(
+    faces_cells: Dict[str, list],
+    color_calibration: Optional[Dict[str, Tuple[float, float, float, float]]] = None,
+    margin: float = 0.25,
+    debug: bool = False
+) -> Dict[str, List[str]]:
+    """
+    Analyse calibrée de plusieurs faces en un seul lot (54 cellules pour un cube).
+    faces_cells: dict face -> liste de ((i,j), cell_roi_bgr)
+    Retourne dict face -> couleurs (même ordre que les cellules).
+    """
+    if color_calibration is None:
+        color_calibration = load_color_calibration()
+
+    faces = list(faces_cells.keys())
+    rgbs = [sample_rgb_from_cell_bgr(cell_roi, margin=margin)
+            for face in faces for (_ij, cell_roi) in faces_cells[face]]
+    cols = classify_many_with_calibration(rgbs, color_calibration, debug_hsv=debug)
+
+    out = {}
+    k = 0
+    for face in faces:
+        n = len(faces_cells[face])
+        out[face] = cols[k:k + n]
+        k += n
+        if debug:
+            print(f"[CALIB] face {face} -> {out[face]}")
+    return out
+
+
 # ---------------------------
 # UI de calibration par clic
 # ---------------------------
@@ -472,22 +607,29 @@ def analyze_colors(cells) -> List[str]:
 class FaceSelector:
     """Interface Matplotlib pour sélectionner une cellule contenant une couleur."""
     def __init__(self, roi_data: Dict[str, tuple], color_name: str):
-        import matplotlib.pyplot as plt
-        self.plt = plt
+        self.plt = None  # matplotlib importé seulement dans show()
         self.roi_data = roi_data
         self.color_name = color_name
         self.selected_face = None
         self.selected_cell = None
         self.face_images = {}
         self.face_axes = {}
+        self._quad_M = {}  # face -> matrice perspective quad -> carré 300x300
 
     def _load_images(self):
-        for f in ["F","R","B","L","U","D"]:
+        # Décodage JPEG en parallèle (cv2 relâche le GIL)
+        from concurrent.futures import ThreadPoolExecutor
+
+        def _load(f):
             p = f"tmp/{f}.jpg"
-            if os.path.exists(p):
-                img = cv2.imread(p)
+            img = cv2.imread(p) if os.path.exists(p) else None
+            # vue RGB (canaux inversés, sans copie) : seul imshow la consomme
+            return f, (None if img is None else img[:, :, ::-1])
+
+        with ThreadPoolExecutor(max_workers=6) as ex:
+            for f, img in ex.map(_load, ["F","R","B","L","U","D"]):
                 if img is not None:
-                    self.face_images[f] = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+                    self.face_images[f] = img
 
     def _cell_from_xy(self, face: str, x: float, y: float):
         """Retourne l'index cellule 0..8 à partir d'un clic (x,y).
@@ -518,11 +660,13 @@ class FaceSelector:
 
         # ---------- QUAD (redressement) ----------
         if is_quad_roi(roi):
-            quad = quad_to_np(roi)
-            dst = np.array([[0, 0], [299, 0], [299, 299], [0, 299]], dtype=np.float32)
+            M = self._quad_M.get(face)
+            if M is None:
+                quad = quad_to_np(roi)
+                dst = np.array([[0, 0], [299, 0], [299, 299], [0, 299]], dtype=np.float32)
+                M = self._quad_M[face] = cv2.getPerspectiveTransform(quad, dst)
 
             # (x,y) -> (u,v) dans le carré 300x300
-            M = cv2.getPerspectiveTransform(quad, dst)
             pt = np.array([[[float(x), float(y)]]], dtype=np.float32)
             uv = cv2.perspectiveTransform(pt, M)[0, 0]
             u, v = float(uv[0]), float(uv[1])
@@ -550,6 +694,7 @@ class FaceSelector:
     def show(self):
         import matplotlib.pyplot as plt
         from matplotlib.patches import Rectangle, Polygon
+        self.plt = plt
 
         self._load_images()
         order = ["F","R","B","L","U","D"]
@@ -668,6 +813,7 @@ def calibrate_colors_interactive(default_tolerance: float = None) -> Optional[Di
         return None
 
     calib: Dict[str, Tuple[float,float,float,float]] = {}
+    warped_cache: Dict[str, tuple] = {}  # face -> (warped, cells), une extraction par face
     for color_name in ["red","orange","yellow","green","blue","white"]:
         print(f"\n=== Calibration couleur: {color_name.upper()} ===")
         try:
@@ -679,9 +825,11 @@ def calibrate_colors_interactive(default_tolerance: float = None) -> Optional[Di
         if face is None or cell_idx is None:
             print(f"Couleur {color_name} ignorée"); continue
 
-        from process_images_cube import process_face_with_roi  # import tardif
-        file_path = f"tmp/{face}.jpg"
-        warped, cells = process_face_with_roi(file_path, roi_data[face], face, show=False, save_intermediates=False)
+        if face not in warped_cache:
+            from process_images_cube import process_face_with_roi  # import tardif
+            file_path = f"tmp/{face}.jpg"
+            warped_cache[face] = process_face_with_roi(file_path, roi_data[face], face, show=False, save_intermediates=False)
+        warped, cells = warped_cache[face]
         if warped is None or not cells or cell_idx >= len(cells):
             print(f"Échec extraction cellules pour {face}"); continue
         (_ij, roi) = cells[cell_idx]
@@ -715,45 +863,44 @@ def calibrate_colors_interactive(default_tolerance: float = None) -> Optional[Di
 
 
 # --- Cache calibration couleurs + centres Lab YO ---
-_COLOR_CALIB_CACHE = None
-_YO_LAB_CENTERS_CACHE = None
+# Calibration : cache mtime de load_color_calibration (_CALIB_CACHE).
+# Centres YO : recalculés quand le mtime de la calibration change.
+_YO_LAB_CENTERS_CACHE = {"cle": None, "centres": None}
 
 def _get_color_calib_cached(path="rubiks_color_calibration.json"):
-    global _COLOR_CALIB_CACHE
-    if _COLOR_CALIB_CACHE is None:
-        try:
-            _COLOR_CALIB_CACHE = load_color_calibration(path)
-        except Exception:
-            _COLOR_CALIB_CACHE = None
-    return _COLOR_CALIB_CACHE
+    try:
+        return load_color_calibration(path)
+    except Exception:
+        return None
 
 def _rgb_to_lab_ab(r: float, g: float, b: float):
     px = np.uint8([[[int(b), int(g), int(r)]]])  # BGR pour OpenCV
     lab = cv2.cvtColor(px, cv2.COLOR_BGR2LAB)[0, 0]
     return float(lab[1]), float(lab[2])  # a, b
 
-def _get_yo_lab_centers_cached():
+def _get_yo_lab_centers_cached(path="rubiks_color_calibration.json"):
     """
     Construit et met en cache les centres (a,b) de yellow/orange à partir
     de rubiks_color_calibration.json (tes centres RGB).
+    Le cache suit le mtime de la calibration (invalidé après sauvegarde).
     """
-    global _YO_LAB_CENTERS_CACHE
-    if _YO_LAB_CENTERS_CACHE is not None:
-        return _YO_LAB_CENTERS_CACHE
-
-    calib = _get_color_calib_cached()
+    calib = _get_color_calib_cached(path)
     if not calib or "yellow" not in calib or "orange" not in calib:
-        _YO_LAB_CENTERS_CACHE = None
         return None
 
+    cle = (path, _CALIB_CACHE[path][0])
+    if _YO_LAB_CENTERS_CACHE["cle"] == cle:
+        return _YO_LAB_CENTERS_CACHE["centres"]
+
     ry, gy, by, _ = calib["yellow"]
     ro, go, bo, _ = calib["orange"]
 
     ay, by2 = _rgb_to_lab_ab(ry, gy, by)
     ao, bo2 = _rgb_to_lab_ab(ro, go, bo)
 
-    _YO_LAB_CENTERS_CACHE = {"yellow": (ay, by2), "orange": (ao, bo2)}
-    return _YO_LAB_CENTERS_CACHE
+    _YO_LAB_CENTERS_CACHE["centres"] = {"yellow": (ay, by2), "orange": (ao, bo2)}
+    _YO_LAB_CENTERS_CACHE["cle"] = cle
+    return _YO_LAB_CENTERS_CACHE["centres"]
 
 def _lab_Lab_from_rgb_sample(r: float, g: float, b: float):
     # OpenCV attend BGR en uint8
@@ -853,8 +1000,7 @@ def _lab_b_from_cell(cell_bgr: np.ndarray, margin: float = 0.25) -> float:
 
 def _hsv_from_rgb(r: float, g: float, b: float):
     """Return (h_deg, s, v). h in degrees [0..360). s,v in [0..255]."""
-    px = np.uint8([[[int(r), int(g), int(b)]]])  # RGB
-    h, s, v = cv2.cvtColor(px, cv2.COLOR_RGB2HSV)[0, 0]
+    h, s, v = _hsv_u8_from_rgb(r, g, b)
     return float(h) * 2.0, float(s), float(v)
 
 # -----------------------------
@@ -22,6 +22,12 @@
 #  Classe Config :
 #     - load()  : charge config.json (ou crée défaut)
 #     - save()  : écrit config.json (indent=2), crée le dossier parent si besoin
+#     - version : compteur incrémenté à chaque load()/set() (clé de cache
+#       pour les valeurs dérivées de la config, y compris set(save=False))
+#     - reload_if_changed() : recharge config.json seulement si son mtime a
+#       changé depuis le dernier load()/save() (sinon un simple stat()).
+#       Opt-in : n'écrase jamais des modifications set(save=False) non
+#       sauvegardées (l'instance est partagée par tous les modules).
 #
 #     - get(key_path, default=None)
 #         Lecture par chemin "a.b.c" dans le dict de config.
@@ -103,10 +109,14 @@ class Config:
     def __init__(self, config_file=CONFIG_FILE):
         self.config_file = Path(config_file)
         self._config = None
+        self._mtime = None
+        self._dirty = False  # set(save=False) non encore sauvegardé
+        self._version = 0    # incrémenté à chaque load()/set()
         self.load()
     
     def load(self):
         """Charge la configuration depuis le fichier JSON"""
+        self._version += 1
         if self.config_file.exists():
             try:
                 with open(self.config_file, 'r') as f:
@@ -116,6 +126,8 @@ class Config:
                 print(f"⚠️ Erreur lors du chargement de la config : {e}")
                 print("📝 Utilisation de la configuration par défaut")
                 self._config = DEFAULT_CONFIG.copy()
+            self._mtime = self._file_mtime()
+            self._dirty = False
         else:
             print(f"ℹ️ Fichier {self.config_file} non trouvé")
             print("📝 Création avec configuration par défaut")
@@ -130,10 +142,44 @@ class Config:
             
             with open(self.config_file, 'w') as f:
                 json.dump(self._config, f, indent=2)
+            self._mtime = self._file_mtime()
+            self._dirty = False
             print(f"✅ Configuration sauvegardée dans {self.config_file}")
         except Exception as e:
             print(f"❌ Erreur lors de la sauvegarde : {e}")
     
+    def _file_mtime(self):
+        """Date de modification du fichier (None s'il est absent/illisible)"""
+        try:
+            return os.stat(self.config_file).st_mtime
+        except OSError:
+            return None
+    
+    def reload_if_changed(self):
+        """
+        Recharge le fichier seulement s'il a été modifié sur disque depuis
+        le dernier load()/save() (un simple stat() sinon).
+        Ne recharge pas tant que des set(save=False) ne sont pas sauvegardés :
+        l'instance est partagée (get_config()), on ne les perd pas.
+        
+        Returns:
+            bool: True si la configuration a été rechargée
+        """
+        if self._dirty or self._file_mtime() == self._mtime:
+            return False
+        self.load()
+        return True
+    
+    @property
+    def mtime(self):
+        """Date de modification du fichier au dernier load()/save()"""
+        return self._mtime
+    
+    @property
+    def version(self):
+        """Compteur de modifications (load()/set()), pour invalider des caches"""
+        return self._version
+    
     def get(self, key_path, default=None):
         """
         Récupère une valeur de configuration en utilisant un chemin de clés
@@ -186,9 +232,12 @@ class Config:
         
         # Définir la valeur
         current[keys[-1]] = value
+        self._version += 1
         
         if save:
             self.save()
+        else:
+            self._dirty = True
         
         print(f"✏️ Configuration mise à jour : {key_path} = {value}")
     